@@ -0,0 +1,91 @@
+"""In-process result caching for MCP tools."""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+class TaskCache:
+    """
+    LRU cache of asyncio tasks with an optional time-to-live.
+
+    Concurrent calls for the same key share one in-flight task, and finished
+    results are served from memory until they expire or are evicted. Failed
+    tasks and results rejected by `keep` (e.g. error dicts) are not retained.
+
+    With `weigh` and `max_weight`, least recently used results are also
+    evicted while the summed weight of finished results exceeds max_weight.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 128,
+        ttl: Optional[float] = None,
+        keep: Callable[[Any], bool] = lambda result: True,
+        weigh: Optional[Callable[[Any], int]] = None,
+        max_weight: Optional[int] = None
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_weight = max_weight
+        self._keep = keep
+        self._weigh = weigh
+        self._entries: "OrderedDict[Hashable, Tuple[asyncio.Future, float]]" = OrderedDict()
+        self._weights: Dict[Hashable, int] = {}
+        self._total_weight = 0
+
+    async def get_or_create(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached result for key, running factory() on a miss."""
+        now = time.monotonic()
+        entry = self._entries.get(key)
+
+        if entry is not None and (self.ttl is None or now - entry[1] < self.ttl):
+            task = entry[0]
+            self._entries.move_to_end(key)
+        else:
+            if entry is not None:
+                self._remove(key)
+            task = asyncio.ensure_future(factory())
+            self._entries[key] = (task, now)
+            self._evict()
+
+        try:
+            # Shielded so a cancelled caller does not cancel the shared task
+            result = await asyncio.shield(task)
+        except Exception:
+            self._discard(key, task)
+            raise
+
+        if not self._keep(result):
+            self._discard(key, task)
+        elif self._weigh is not None and key not in self._weights and self._holds(key, task):
+            self._weights[key] = self._weigh(result)
+            self._total_weight += self._weights[key]
+            self._evict()
+        return result
+
+    def invalidate(self, predicate: Callable[[Hashable], bool]) -> None:
+        """Drop every entry, finished or in flight, whose key matches predicate."""
+        for key in [key for key in self._entries if predicate(key)]:
+            self._remove(key)
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until size and weight are within limits."""
+        while self._entries and (
+            len(self._entries) > self.maxsize
+            or (self.max_weight is not None and self._total_weight > self.max_weight)
+        ):
+            self._remove(next(iter(self._entries)))
+
+    def _holds(self, key: Hashable, task: asyncio.Future) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and entry[0] is task
+
+    def _discard(self, key: Hashable, task: asyncio.Future) -> None:
+        """Remove key if it still refers to task."""
+        if self._holds(key, task):
+            self._remove(key)
+
+    def _remove(self, key: Hashable) -> None:
+        del self._entries[key]
+        self._total_weight -= self._weights.pop(key, 0)
@@ -0,0 +1,165 @@
+"""Helpers for calling Google APIs from async MCP handlers."""
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict
+
+import google_auth_httplib2
+import httplib2
+from googleapiclient.discovery import build
+from googleapiclient.http import build_http
+
+# Threads for blocking Google API calls; each one waits out a network round trip
+MAX_WORKERS = int(os.getenv("GDRIVE_MAX_WORKERS", "32"))
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix='gdrive')
+
+
+class ThreadLocalHttp:
+    """
+    Stand-in for httplib2.Http that gives each thread its own instance.
+
+    httplib2.Http is not thread-safe, but reusing one per worker thread keeps
+    its connections alive across requests instead of opening a new TLS
+    connection for every call. Each instance comes from build_http(), so it
+    has googleapiclient's socket timeout and treats 308 as a resumable-upload
+    status rather than a redirect.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def _http(self) -> httplib2.Http:
+        http = getattr(self._local, 'http', None)
+        if http is None:
+            http = self._local.http = build_http()
+        return http
+
+    def request(self, *args: Any, **kwargs: Any) -> Any:
+        return self._http().request(*args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._http(), name)
+
+
+# Connections shared by every service built here, one pool per worker thread
+_thread_http = ThreadLocalHttp()
+
+
+@functools.lru_cache(maxsize=None)
+def build_service(service_name: str, version: str, credentials: Any) -> Any:
+    """
+    Build a Google API client whose requests can run on worker threads.
+
+    Uses the discovery document bundled with googleapiclient rather than
+    fetching it over the network. Clients are cached per service, version
+    and credentials, so registering tools again reuses the parsed
+    discovery document instead of building a new client.
+    """
+    authorized_http = google_auth_httplib2.AuthorizedHttp(credentials, http=_thread_http)
+    return build(
+        service_name,
+        version,
+        http=authorized_http,
+        static_discovery=True,
+        cache_discovery=False
+    )
+
+
+# Serializes token refreshes across worker threads
+_token_lock = threading.Lock()
+
+
+def _ensure_token(credentials: Any) -> None:
+    """
+    Refresh credentials that are missing or near expiry, one thread at a time.
+
+    Called on a worker thread before a request is sent. Without the lock,
+    concurrent requests that find the token expired each refresh it.
+    """
+    if credentials.valid:
+        return
+    with _token_lock:
+        if not credentials.valid:
+            credentials.refresh(google_auth_httplib2.Request(_thread_http))
+
+
+def warm_up(service: Any) -> None:
+    """Fetch the service's access token; call once at startup, before serving requests."""
+    _ensure_token(service._http.credentials)
+
+
+async def run_blocking(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking call in a worker thread so the event loop stays free."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(fn, *args, **kwargs))
+
+
+async def execute(request: Any, num_retries: int = 0) -> Any:
+    """
+    Execute a googleapiclient request without blocking the event loop.
+
+    num_retries is passed to execute(), which retries 5xx, 429 and
+    connection errors with exponential backoff.
+    """
+    def send() -> Any:
+        _ensure_token(request.http.credentials)
+        return request.execute(num_retries=num_retries)
+
+    return await run_blocking(send)
+
+
+async def execute_batch(service: Any, requests: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Send several requests to the same API in a single batch HTTP call.
+
+    Returns the responses keyed like `requests`; the first failed
+    request's HttpError is raised after the batch completes.
+    """
+    responses: Dict[str, Any] = {}
+    errors: Dict[str, Exception] = {}
+
+    def callback(request_id, response, exception):
+        if exception is not None:
+            errors[request_id] = exception
+        else:
+            responses[request_id] = response
+
+    batch = service.new_batch_http_request(callback=callback)
+    for request_id, request in requests.items():
+        batch.add(request, request_id=request_id)
+
+    def send() -> None:
+        _ensure_token(service._http.credentials)
+        batch.execute()
+
+    await run_blocking(send)
+
+    for request_id in requests:
+        if request_id in errors:
+            raise errors[request_id]
+    return responses
+
+
+async def iter_pages(list_method: Callable[..., Any], **kwargs: Any) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Yield every page of a paginated list call, starting from `pageToken`
+    when one is given.
+
+    The request for the next page is sent as soon as its token is known,
+    so it is in flight while the caller processes the current page.
+    """
+    pending = asyncio.ensure_future(execute(list_method(**kwargs)))
+    kwargs.pop('pageToken', None)
+    try:
+        while pending is not None:
+            page = await pending
+            page_token = page.get('nextPageToken')
+            pending = None
+            if page_token:
+                pending = asyncio.ensure_future(execute(list_method(pageToken=page_token, **kwargs)))
+            yield page
+    finally:
+        if pending is not None:
+            pending.cancel()
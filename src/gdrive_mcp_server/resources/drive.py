@@ -1,21 +1,22 @@
 """Google Drive resources for MCP server."""
-from typing import Any
+from typing import Any, Awaitable, Callable, Dict
 
 from mcp.server.fastmcp import FastMCP
 
 
-def register_drive_resources(mcp: FastMCP, drive_service: Any) -> None:
-    """Register Google Drive resources with the MCP server."""
+def register_drive_resources(
+    mcp: FastMCP,
+    drive_service: Any,
+    read_file: Callable[..., Awaitable[Dict[str, Any]]]
+) -> None:
+    """
+    Register Google Drive resources with the MCP server.
     
-    # We need to access the gdrive_read_file tool that was registered
-    # So we'll create our own implementation here
-    async def read_file_for_resource(file_id: str):
-        """Internal function to read file for resource."""
-        # Find the gdrive_read_file tool in the registered tools
-        for tool in mcp._tools.values():
-            if tool.name == "gdrive_read_file":
-                return await tool.fn(file_id=file_id)
-        raise RuntimeError("gdrive_read_file tool not found")
+    Args:
+        mcp: The MCP server instance
+        drive_service: Google Drive API service
+        read_file: The gdrive_read_file tool returned by register_drive_tools
+    """
     
     @mcp.resource("gdrive:///{file_id}")
     async def read_drive_resource(file_id: str) -> str:
@@ -28,7 +29,7 @@ def register_drive_resources(mcp: FastMCP, drive_service: Any) -> None:
         Returns:
             File content as string
         """
-        result = await read_file_for_resource(file_id)
+        result = await read_file(file_id=file_id)
         
         if "error" in result:
             raise RuntimeError(result["error"])
@@ -36,6 +37,9 @@ def register_drive_resources(mcp: FastMCP, drive_service: Any) -> None:
         content = result.get("content", "")
         encoding = result.get("encoding", "utf-8")
         
+        if result.get("truncated"):
+            content += f"\n[Truncated - continue with gdrive_read_file offset={result['next_offset']}]"
+        
         if encoding == "base64":
             return f"[Binary file - Base64 encoded]\n{content}"
         
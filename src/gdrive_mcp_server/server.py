@@ -1,4 +1,5 @@
 import argparse
+import asyncio
 import os
 import sys
 from pathlib import Path
@@ -6,9 +7,9 @@ from typing import Any, Optional
 
 from mcp.server.fastmcp import FastMCP
 from google.oauth2 import service_account
-from googleapiclient.discovery import build
 from dotenv import load_dotenv
 
+from .google_api import build_service, warm_up
 from .tools.drive import register_drive_tools
 from .resources.drive import register_drive_resources
 
@@ -28,7 +29,7 @@ def initialize_drive_service(credentials_path: str) -> Any:
             credentials_path,
             scopes=['https://www.googleapis.com/auth/drive.readonly']
         )
-        return build('drive', 'v3', credentials=credentials)
+        return build_service('drive', 'v3', credentials)
     except Exception as e:
         raise RuntimeError(f"Failed to initialize Drive service: {e}")
 
@@ -60,15 +61,29 @@ def main():
         drive_service = initialize_drive_service(str(creds_path))
         print(f"Successfully initialized Google Drive service with {creds_path}", file=sys.stderr)
         
+        # Get the access token now rather than on the first tool call
+        try:
+            warm_up(drive_service)
+        except Exception as e:
+            # Tool calls will retry the token fetch and report the error
+            print(f"Warning: Failed to fetch Drive access token: {e}", file=sys.stderr)
+        
         # Register tools and resources
-        register_drive_tools(mcp, drive_service)
-        register_drive_resources(mcp, drive_service)
+        read_file = register_drive_tools(mcp, drive_service)
+        register_drive_resources(mcp, drive_service, read_file)
         print("Registered Google Drive tools and resources", file=sys.stderr)
         
     except Exception as e:
         print(f"Failed to initialize Drive service: {e}", file=sys.stderr)
         sys.exit(1)
     
+    # Use uvloop for the event loop when it is installed (perf extra)
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+    
     # Run the MCP server as HTTP on localhost:8000
     # The FastMCP server will handle the /mcp-servers/gdrive-mcp-server/ path
     mcp.settings.host = "127.0.0.1"
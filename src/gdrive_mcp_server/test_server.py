@@ -1,16 +1,18 @@
 import argparse
 import os
 import sys
+from collections import Counter
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from mcp.server.fastmcp import FastMCP
 import uvicorn
 from google.oauth2 import service_account
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from dotenv import load_dotenv
 
+from .google_api import build_service, execute, execute_batch, iter_pages, warm_up
 from .tools.sheets import register_sheets_tools
 from .tools.drive import register_drive_tools
 from .resources.drive import register_drive_resources
@@ -21,13 +23,45 @@ load_dotenv()
 # Initialize FastMCP server with HTTP path
 mcp = FastMCP("gdrive-test-server", transport="http", path_prefix="/mcp-servers/gdrive-test-server")
 
-# Global Drive service instance
-drive_service: Optional[Any] = None
-
 # Get folder ID from environment
 FOLDER_ID = os.getenv("FOLDER_ID")
 
 
+@dataclass(frozen=True, slots=True)
+class DriveConfig:
+    """Drive service and default folder used by the test server tools."""
+    service: Any
+    default_folder: Optional[str]
+    default_folder_query: Optional[str] = field(init=False)
+    
+    def __post_init__(self):
+        # Built once, since most calls use the default folder
+        query = f"'{self.default_folder}' in parents" if self.default_folder else None
+        object.__setattr__(self, 'default_folder_query', query)
+    
+    def resolve_folder(self, folder_id: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+        """Return the target folder and its 'in parents' query, falling back to the default folder."""
+        if not folder_id:
+            return self.default_folder, self.default_folder_query
+        return folder_id, f"'{folder_id}' in parents"
+
+
+# Global Drive configuration, set in main()
+config: Optional[DriveConfig] = None
+
+# files.list projections for get_folder_metadata
+SUMMARY_FOLDER_FIELDS = "nextPageToken, files(id, name, mimeType, size, modifiedTime, parents)"
+DETAIL_FOLDER_FIELDS = (
+    "nextPageToken, "
+    "files(id, name, mimeType, size, createdTime, modifiedTime, "
+    "webViewLink, webContentLink, parents, description, "
+    "starred, trashed, version, originalFilename, "
+    "owners, lastModifyingUser, shared, viewers, "
+    "sharingUser, permissions(id, type, role, emailAddress), "
+    "capabilities(canEdit, canComment, canShare, canDownload, canReadRevisions))"
+)
+
+
 def initialize_drive_service(credentials_path: str) -> Any:
     """Initialize Google Drive service with service account credentials."""
     try:
@@ -38,7 +72,7 @@ def initialize_drive_service(credentials_path: str) -> Any:
                 'https://www.googleapis.com/auth/drive.file'  # For creating files
             ]
         )
-        return build('drive', 'v3', credentials=credentials)
+        return build_service('drive', 'v3', credentials)
     except Exception as e:
         raise RuntimeError(f"Failed to initialize Drive service: {e}")
 
@@ -95,17 +129,17 @@ async def list_files(
     Returns:
         Dictionary containing list of files and metadata
     """
-    if not drive_service:
+    if not config:
         return {"error": "Drive service not initialized"}
     
     # Use provided folder_id or fall back to environment variable
-    target_folder = folder_id or FOLDER_ID
+    target_folder, folder_query = config.resolve_folder(folder_id)
     if not target_folder:
         return {"error": "No folder ID provided and FOLDER_ID environment variable not set"}
     
     try:
         # Build query
-        query_parts = [f"'{target_folder}' in parents"]
+        query_parts = [folder_query]
         if mime_type:
             query_parts.append(f"mimeType = '{mime_type}'")
         query = " and ".join(query_parts)
@@ -114,26 +148,19 @@ async def list_files(
         page_size = min(max(page_size, 1), 1000)
         
         all_files = []
-        page_token = None
         
-        while True:
-            try:
-                results = drive_service.files().list(
-                    q=query,
-                    pageSize=page_size,
-                    fields="nextPageToken, files(id, name, mimeType, size, createdTime, modifiedTime, webViewLink, parents)",
-                    pageToken=page_token
-                ).execute()
-                
+        try:
+            async for results in iter_pages(
+                config.service.files().list,
+                q=query,
+                pageSize=page_size,
+                fields="nextPageToken, files(id, name, mimeType, size, createdTime, modifiedTime, webViewLink, parents)"
+            ):
                 files = results.get('files', [])
                 all_files.extend(files)
                 
-                page_token = results.get('nextPageToken')
-                if not page_token:
-                    break
-                    
-            except HttpError as e:
-                return handle_api_error(e)
+        except HttpError as e:
+            return handle_api_error(e)
         
         return {
             "folder_id": target_folder,
@@ -160,11 +187,11 @@ async def create_sheet(
     Returns:
         Dictionary containing created sheet metadata
     """
-    if not drive_service:
+    if not config:
         return {"error": "Drive service not initialized"}
     
     # Use provided folder_id or fall back to environment variable
-    target_folder = folder_id or FOLDER_ID
+    target_folder, _ = config.resolve_folder(folder_id)
     if not target_folder:
         return {"error": "No folder ID provided and FOLDER_ID environment variable not set"}
     
@@ -178,10 +205,10 @@ async def create_sheet(
         
         # Create the sheet
         try:
-            sheet = drive_service.files().create(
+            sheet = await execute(config.service.files().create(
                 body=file_metadata,
                 fields='id, name, webViewLink, createdTime'
-            ).execute()
+            ))
             
             return {
                 "success": True,
@@ -203,7 +230,9 @@ async def create_sheet(
 @mcp.tool()
 async def get_folder_metadata(
     folder_id: Optional[str] = None,
-    include_subfolders: bool = False
+    include_subfolders: bool = False,
+    detail: bool = False,
+    summary_only: bool = False
 ) -> Dict[str, Any]:
     """
     Get comprehensive metadata about all files in a folder.
@@ -211,77 +240,85 @@ async def get_folder_metadata(
     Args:
         folder_id: Folder ID to analyze (defaults to FOLDER_ID env var)
         include_subfolders: Whether to include files from subfolders recursively
+        detail: Include sharing, ownership, permissions and capabilities per file
+        summary_only: Return only folder details and statistics, without the file list
         
     Returns:
         Dictionary containing detailed metadata for all files
     """
-    if not drive_service:
+    if not config:
         return {"error": "Drive service not initialized"}
     
     # Use provided folder_id or fall back to environment variable
-    target_folder = folder_id or FOLDER_ID
+    target_folder, folder_query = config.resolve_folder(folder_id)
     if not target_folder:
         return {"error": "No folder ID provided and FOLDER_ID environment variable not set"}
     
     try:
-        # Get folder details first
-        try:
-            folder_info = drive_service.files().get(
-                fileId=target_folder,
-                fields='id, name, mimeType, createdTime, modifiedTime, owners'
-            ).execute()
-        except HttpError as e:
-            return handle_api_error(e)
-        
         # Build query
         if include_subfolders:
             # This requires a more complex implementation to traverse folder tree
             # For now, just get direct children
-            query = f"'{target_folder}' in parents"
+            query = folder_query
         else:
-            query = f"'{target_folder}' in parents"
+            query = folder_query
+        
+        # Permissions and capabilities are expensive for Drive to assemble,
+        # so only request the comprehensive field list when asked for
+        fields = DETAIL_FOLDER_FIELDS if detail else SUMMARY_FOLDER_FIELDS
+        
+        # Fetch folder details and the first page of files in one batch call
+        try:
+            first = await execute_batch(config.service, {
+                'folder': config.service.files().get(
+                    fileId=target_folder,
+                    fields='id, name, mimeType, createdTime, modifiedTime, owners'
+                ),
+                'files': config.service.files().list(
+                    q=query,
+                    pageSize=100,
+                    fields=fields
+                )
+            })
+        except HttpError as e:
+            return handle_api_error(e)
         
         all_files = []
-        page_token = None
+        total_files = 0
+        total_size = 0
+        mime_type_counts = Counter()
         
-        # Comprehensive field list for metadata
-        fields = (
-            "nextPageToken, "
-            "files(id, name, mimeType, size, createdTime, modifiedTime, "
-            "webViewLink, webContentLink, parents, description, "
-            "starred, trashed, version, originalFilename, "
-            "owners, lastModifyingUser, shared, viewers, "
-            "sharingUser, permissions(id, type, role, emailAddress), "
-            "capabilities(canEdit, canComment, canShare, canDownload, canReadRevisions))"
-        )
+        def add_files(files: List[Dict[str, Any]]) -> None:
+            """Update folder statistics with a page of files, keeping them unless summary_only."""
+            nonlocal total_files, total_size
+            total_files += len(files)
+            for f in files:
+                mime_type_counts[f.get('mimeType', 'unknown')] += 1
+                size = f.get('size')
+                if size:
+                    total_size += int(size)
+            if not summary_only:
+                all_files.extend(files)
+        
+        folder_info = first['folder']
+        add_files(first['files'].get('files', []))
+        page_token = first['files'].get('nextPageToken')
         
-        while True:
+        if page_token:
             try:
-                results = drive_service.files().list(
+                async for results in iter_pages(
+                    config.service.files().list,
                     q=query,
                     pageSize=100,
                     fields=fields,
                     pageToken=page_token
-                ).execute()
-                
-                files = results.get('files', [])
-                all_files.extend(files)
-                
-                page_token = results.get('nextPageToken')
-                if not page_token:
-                    break
+                ):
+                    add_files(results.get('files', []))
                     
             except HttpError as e:
                 return handle_api_error(e)
         
-        # Calculate folder statistics
-        total_size = sum(int(f.get('size', 0)) for f in all_files if f.get('size'))
-        mime_type_counts = {}
-        for f in all_files:
-            mime_type = f.get('mimeType', 'unknown')
-            mime_type_counts[mime_type] = mime_type_counts.get(mime_type, 0) + 1
-        
-        return {
+        result = {
             "folder": {
                 "id": folder_info.get('id'),
                 "name": folder_info.get('name'),
@@ -290,25 +327,28 @@ async def get_folder_metadata(
                 "owners": folder_info.get('owners', [])
             },
             "statistics": {
-                "total_files": len(all_files),
+                "total_files": total_files,
                 "total_size_bytes": total_size,
                 "total_size_readable": format_bytes(total_size),
-                "mime_type_distribution": mime_type_counts
-            },
-            "files": all_files
+                "mime_type_distribution": dict(mime_type_counts)
+            }
         }
+        if not summary_only:
+            result["files"] = all_files
+        return result
         
     except Exception as e:
         return {"error": f"Unexpected error: {str(e)}"}
 
 
-def format_bytes(bytes: int) -> str:
+BYTE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
+
+def format_bytes(size: int) -> str:
     """Convert bytes to human readable format."""
-    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-        if bytes < 1024.0:
-            return f"{bytes:.2f} {unit}"
-        bytes /= 1024.0
-    return f"{bytes:.2f} PB"
+    # Each unit is 2**10 larger, so the bit length picks the unit directly
+    index = min(max(size.bit_length() - 1, 0) // 10, len(BYTE_UNITS) - 1)
+    return f"{size / (1 << (index * 10)):.2f} {BYTE_UNITS[index]}"
 
 
 def main():
@@ -330,18 +370,26 @@ def main():
         sys.exit(1)
     
     # Initialize Drive service
-    global drive_service
+    global config
     try:
         drive_service = initialize_drive_service(str(creds_path))
+        config = DriveConfig(service=drive_service, default_folder=FOLDER_ID)
         print(f"Successfully initialized Google Drive service with {creds_path}", file=sys.stderr)
         if FOLDER_ID:
             print(f"Using folder ID from environment: {FOLDER_ID}", file=sys.stderr)
         else:
             print("Warning: No FOLDER_ID set in environment", file=sys.stderr)
         
+        # Get the access token now rather than on the first tool call
+        try:
+            warm_up(drive_service)
+        except Exception as e:
+            # Tool calls will retry the token fetch and report the error
+            print(f"Warning: Failed to fetch Drive access token: {e}", file=sys.stderr)
+        
         # Register all tools and resources
-        register_drive_tools(mcp, drive_service)
-        register_drive_resources(mcp, drive_service)
+        read_file = register_drive_tools(mcp, drive_service)
+        register_drive_resources(mcp, drive_service, read_file)
         register_sheets_tools(mcp, drive_service)
         print("Registered Google Drive and Sheets tools", file=sys.stderr)
         
@@ -355,7 +403,8 @@ def main():
         app,
         host="127.0.0.1",  # Only localhost connections
         port=8001,
-        log_level="info"
+        log_level="info",
+        loop="auto"  # uvloop when installed (perf extra), asyncio otherwise
     )
 
 
@@ -1,20 +1,243 @@
 """Google Drive tools for MCP server."""
 import base64
+import codecs
 import io
 import os
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
 
 from mcp.server.fastmcp import FastMCP
 from googleapiclient.errors import HttpError
-from googleapiclient.http import MediaIoBaseDownload
+from googleapiclient.http import DEFAULT_CHUNK_SIZE, MediaIoBaseDownload
 
+from ..cache import TaskCache
+from ..google_api import execute, run_blocking
 
-def register_drive_tools(mcp: FastMCP, drive_service: Any) -> None:
-    """Register Google Drive tools with the MCP server."""
+
+# Escapes for string literals in Drive query syntax
+DRIVE_QUERY_ESCAPE = str.maketrans({"\\": "\\\\", "'": "\\'"})
+
+# Bytes fetched per ranged download request (GDRIVE_CHUNK_SIZE env var)
+DOWNLOAD_CHUNK_SIZE = int(os.getenv("GDRIVE_CHUNK_SIZE", str(DEFAULT_CHUNK_SIZE)))
+
+# Retries for transient errors on ranged downloads, which are safe to repeat
+DOWNLOAD_RETRIES = 3
+
+# Bytes base64-encoded at a time; a multiple of 3 so slices concatenate cleanly
+BASE64_SLICE_BYTES = 3 * 1024 * 1024
+
+# gdrive_read_file results kept in memory, the largest content worth keeping,
+# and the most content characters kept across all results
+READ_CACHE_SIZE = 128
+READ_CACHE_MAX_CHARS = 4 * 1024 * 1024
+READ_CACHE_TOTAL_CHARS = 32 * 1024 * 1024
+
+# Seconds a gdrive_search result is reused
+SEARCH_CACHE_TTL = 30
+
+
+async def _iter_download_chunks(
+    request: Any,
+    offset: int = 0,
+    size: Optional[int] = None,
+    limit: Optional[int] = None
+) -> AsyncIterator[bytes]:
+    """
+    Yield the bytes of a media request one downloaded chunk at a time, skipping the first `offset` bytes.
+    
+    Stored files (those with a known size) are fetched with Range requests
+    starting at `offset`, each at most one byte over `limit` (the extra byte
+    tells the reader whether the file continues), so only the part being
+    read is transferred. Google Workspace exports do not support ranges and
+    are streamed from the start, with the bytes before `offset` dropped.
+    """
+    if size is not None:
+        chunk_size = min(DOWNLOAD_CHUNK_SIZE, limit + 1) if limit else DOWNLOAD_CHUNK_SIZE
+        while offset < size:
+            request.headers['range'] = f"bytes={offset}-{min(offset + chunk_size, size) - 1}"
+            chunk = await execute(request, num_retries=DOWNLOAD_RETRIES)
+            if not chunk:
+                return
+            yield chunk
+            offset += len(chunk)
+        return
+    
+    buffer = io.BytesIO()
+    downloader = MediaIoBaseDownload(buffer, request, chunksize=DOWNLOAD_CHUNK_SIZE)
+    done = False
+    
+    while not done:
+        _, done = await run_blocking(downloader.next_chunk)
+        chunk = buffer.getvalue()
+        # Drop the chunk so only one is held in memory at a time
+        buffer.seek(0)
+        buffer.truncate()
+        
+        if offset:
+            skipped = min(offset, len(chunk))
+            chunk = chunk[skipped:]
+            offset -= skipped
+        if chunk:
+            yield chunk
+
+
+class _NotUtf8(Exception):
+    """Raised by _decode_utf8 with the bytes it had already received."""
+    
+    def __init__(self, received: List[bytes]):
+        super().__init__("content is not valid UTF-8")
+        self.received = received
+
+
+async def _prepend(received: List[bytes], chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Yield already received chunks, then the rest of the stream."""
+    for chunk in received:
+        yield chunk
+    async for chunk in chunks:
+        yield chunk
+
+
+async def _decode_utf8(chunks: AsyncIterator[bytes], max_bytes: Optional[int] = None) -> Tuple[str, int, bool]:
+    """
+    Decode UTF-8 chunks, keeping multi-byte characters split across chunks intact.
+    
+    Raises _NotUtf8 with the bytes read so far if the content is not UTF-8,
+    so the caller can fall back without downloading them again.
+    
+    Returns:
+        Tuple of (text, bytes consumed, whether input was cut at max_bytes)
+    """
+    if max_bytes is not None:
+        # Room for at least one full character so reads always advance
+        max_bytes = max(max_bytes, 4)
+    
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    parts = []
+    consumed = 0
+    truncated = False
+    
+    def not_utf8(*tail: bytes) -> _NotUtf8:
+        # Text decoded so far re-encodes to exactly the bytes it came from
+        pending, _ = decoder.getstate()
+        return _NotUtf8([part.encode('utf-8') for part in parts] + [pending, *tail])
+    
+    async for raw in chunks:
+        chunk = raw
+        if max_bytes is not None and consumed + len(chunk) > max_bytes:
+            chunk = chunk[:max_bytes - consumed]
+            truncated = True
+        try:
+            parts.append(decoder.decode(chunk))
+        except UnicodeDecodeError:
+            raise not_utf8(raw) from None
+        consumed += len(chunk)
+        if truncated:
+            break
+    
+    if truncated:
+        # A character split by the cut is left for the next read
+        pending, _ = decoder.getstate()
+        consumed -= len(pending)
+    else:
+        try:
+            parts.append(decoder.decode(b'', final=True))
+        except UnicodeDecodeError:
+            raise not_utf8() from None
+    return ''.join(parts), consumed, truncated
+
+
+async def _encode_base64(chunks: AsyncIterator[bytes], max_bytes: Optional[int] = None) -> Tuple[str, int, bool]:
+    """
+    Base64-encode chunks in 3-byte-aligned slices so the pieces concatenate cleanly.
+    
+    Returns:
+        Tuple of (base64 text, bytes consumed, whether input was cut at max_bytes)
+    """
+    if max_bytes is not None:
+        # Whole 3-byte groups keep resumed reads concatenable
+        max_bytes = max(max_bytes - max_bytes % 3, 3)
+    
+    parts = []
+    carry = b''
+    consumed = 0
+    truncated = False
+    
+    async for chunk in chunks:
+        if max_bytes is not None and consumed + len(chunk) > max_bytes:
+            chunk = chunk[:max_bytes - consumed]
+            truncated = True
+        consumed += len(chunk)
+        data = memoryview(carry + chunk if carry else chunk)
+        aligned = len(data) - len(data) % 3
+        # Encode in slices so a large chunk never has a full-size encoded copy
+        for start in range(0, aligned, BASE64_SLICE_BYTES):
+            end = min(start + BASE64_SLICE_BYTES, aligned)
+            parts.append(base64.b64encode(data[start:end]).decode('ascii'))
+        carry = bytes(data[aligned:])
+        if truncated:
+            break
+    
+    parts.append(base64.b64encode(carry).decode('ascii'))
+    return ''.join(parts), consumed, truncated
+
+
+async def _read_content(
+    request: Any,
+    as_text: bool,
+    offset: int,
+    max_bytes: Optional[int],
+    size: Optional[int] = None
+) -> Dict[str, Any]:
+    """Download a media request and return its content fields for gdrive_read_file."""
+    chunks = _iter_download_chunks(request, offset, size, max_bytes)
+    encoding = "base64"
+    
+    if as_text:
+        try:
+            content, consumed, truncated = await _decode_utf8(chunks, max_bytes)
+            encoding = "utf-8"
+        except _NotUtf8 as e:
+            # Fallback to base64 if text decode fails, reusing the bytes already downloaded
+            chunks = _prepend(e.received, chunks)
+    
+    if encoding == "base64":
+        content, consumed, truncated = await _encode_base64(chunks, max_bytes)
+    
+    result = {
+        "content": content,
+        "encoding": encoding,
+        "truncated": truncated
+    }
+    if truncated:
+        result["next_offset"] = offset + consumed
+    return result
+
+
+def register_drive_tools(mcp: FastMCP, drive_service: Any) -> Callable[..., Awaitable[Dict[str, Any]]]:
+    """
+    Register Google Drive tools with the MCP server.
+    
+    Returns:
+        The gdrive_read_file tool function, for reuse by the Drive resources
+    """
     
     # Get folder ID from environment
     FOLDER_ID = os.getenv("FOLDER_ID")
     
+    # Folder restriction prepended to every search query
+    folder_prefix = f"'{FOLDER_ID}' in parents and " if FOLDER_ID else ""
+    
+    # Default cap on bytes returned per gdrive_read_file call (unset or 0 = no cap)
+    READ_MAX_BYTES = int(os.getenv("GDRIVE_READ_MAX_BYTES", "0")) or None
+    
+    # Recent results, so repeated reads and searches skip the download
+    read_cache = TaskCache(
+        maxsize=READ_CACHE_SIZE,
+        keep=lambda content: len(content["content"]) <= READ_CACHE_MAX_CHARS,
+        weigh=lambda content: len(content["content"]),
+        max_weight=READ_CACHE_TOTAL_CHARS
+    )
+    search_cache = TaskCache(maxsize=READ_CACHE_SIZE, ttl=SEARCH_CACHE_TTL)
+    
     @mcp.tool()
     async def gdrive_search(query: str) -> Dict[str, Any]:
         """
@@ -30,19 +253,18 @@ def register_drive_tools(mcp: FastMCP, drive_service: Any) -> None:
             return {"error": "Drive service not initialized"}
         
         try:
-            # Escape single quotes in query and create full-text search
-            escaped_query = query.replace("'", "\\'")
-            search_query = f"fullText contains '{escaped_query}'"
+            # Escape the query and create full-text search, restricted to FOLDER_ID if set
+            escaped_query = query.translate(DRIVE_QUERY_ESCAPE)
+            search_query = f"{folder_prefix}fullText contains '{escaped_query}'"
             
-            # Add folder restriction if FOLDER_ID is set
-            if FOLDER_ID:
-                search_query = f"'{FOLDER_ID}' in parents and {search_query}"
-            
-            results = drive_service.files().list(
-                q=search_query,
-                pageSize=20,
-                fields="files(id, name, mimeType, modifiedTime, size, webViewLink)"
-            ).execute()
+            results = await search_cache.get_or_create(
+                search_query,
+                lambda: execute(drive_service.files().list(
+                    q=search_query,
+                    pageSize=20,
+                    fields="files(id, name, mimeType, modifiedTime, size, webViewLink)"
+                ))
+            )
             
             files = results.get('files', [])
             
@@ -57,12 +279,21 @@ def register_drive_tools(mcp: FastMCP, drive_service: Any) -> None:
     
     
     @mcp.tool()
-    async def gdrive_read_file(file_id: str) -> Dict[str, Any]:
+    async def gdrive_read_file(
+        file_id: str,
+        offset: int = 0,
+        max_bytes: Optional[int] = None
+    ) -> Dict[str, Any]:
         """
         Read the contents of a file from Google Drive.
         
+        Large files can be read in parts: when the content is cut at max_bytes
+        the result has truncated=True and a next_offset to continue from.
+        
         Args:
             file_id: The ID of the file to read
+            offset: Byte offset to start reading from (use next_offset to resume)
+            max_bytes: Maximum number of bytes to read (defaults to GDRIVE_READ_MAX_BYTES env var, unlimited if unset)
             
         Returns:
             Dictionary containing file content or error
@@ -72,7 +303,10 @@ def register_drive_tools(mcp: FastMCP, drive_service: Any) -> None:
         
         try:
             # Get file metadata
-            file_metadata = drive_service.files().get(fileId=file_id).execute()
+            file_metadata = await execute(drive_service.files().get(
+                fileId=file_id,
+                fields='id, name, mimeType, modifiedTime, size'
+            ))
             mime_type = file_metadata.get('mimeType', '')
             file_name = file_metadata.get('name', 'Unknown')
             
@@ -94,50 +328,31 @@ def register_drive_tools(mcp: FastMCP, drive_service: Any) -> None:
                 # Regular file download
                 request = drive_service.files().get_media(fileId=file_id)
             
-            # Download file content
-            file_buffer = io.BytesIO()
-            downloader = MediaIoBaseDownload(file_buffer, request)
-            done = False
+            limit = max_bytes or READ_MAX_BYTES
+            # Exports are decoded according to the type they are exported as
+            content_type = export_mime_types.get(mime_type, mime_type)
+            as_text = content_type.startswith('text/') or content_type == 'application/json'
             
-            while not done:
-                _, done = downloader.next_chunk()
+            # Drive reports size only for stored files, not Google Workspace exports
+            size = int(file_metadata['size']) if 'size' in file_metadata else None
             
-            file_buffer.seek(0)
-            content_bytes = file_buffer.read()
+            # Keyed by modifiedTime so an edited file misses the cache
+            cache_key = (file_id, file_metadata.get('modifiedTime'), offset, limit)
+            content = await read_cache.get_or_create(
+                cache_key,
+                lambda: _read_content(request, as_text, offset, limit, size)
+            )
             
-            # Try to decode as text, otherwise return base64
-            try:
-                if mime_type.startswith('text/') or mime_type in ['application/json'] or mime_type in export_mime_types:
-                    content = content_bytes.decode('utf-8')
-                    return {
-                        "file_id": file_id,
-                        "name": file_name,
-                        "mime_type": mime_type,
-                        "content": content,
-                        "encoding": "utf-8"
-                    }
-                else:
-                    # Binary content
-                    content = base64.b64encode(content_bytes).decode('utf-8')
-                    return {
-                        "file_id": file_id,
-                        "name": file_name,
-                        "mime_type": mime_type,
-                        "content": content,
-                        "encoding": "base64"
-                    }
-            except UnicodeDecodeError:
-                # Fallback to base64 if text decode fails
-                content = base64.b64encode(content_bytes).decode('utf-8')
-                return {
-                    "file_id": file_id,
-                    "name": file_name,
-                    "mime_type": mime_type,
-                    "content": content,
-                    "encoding": "base64"
-                }
+            return {
+                "file_id": file_id,
+                "name": file_name,
+                "mime_type": mime_type,
+                **content
+            }
                 
         except HttpError as e:
             return {"error": f"Failed to read file: {e}"}
         except Exception as e:
-            return {"error": f"Unexpected error: {e}"}
\ No newline at end of file
+            return {"error": f"Unexpected error: {e}"}
+    
+    return gdrive_read_file
@@ -1,20 +1,427 @@
 """Google Sheets specific tools for expense tracking and recordkeeping."""
+import asyncio
 import json
-from typing import Any, Dict, List, Optional, Union
+import os
+import re
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple, Union
 from datetime import datetime
 
 from mcp.server.fastmcp import FastMCP
 from google.oauth2 import service_account
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+from ..cache import TaskCache
+from ..google_api import build_service, execute
+
+
+# Retries for transient errors on reads and idempotent writes; appends and
+# batchUpdates are not retried since a repeated call could apply twice
+READ_RETRIES = 3
+
+# Seconds a batchUpdate request waits for others to the same spreadsheet
+BATCH_UPDATE_WAIT = 0.02
+
+# Most requests merged into one batchUpdate call
+BATCH_UPDATE_MAX_REQUESTS = 100
+
+# Seconds an appended row waits for others to the same spreadsheet (GDRIVE_APPEND_WAIT env var)
+APPEND_WAIT = float(os.getenv("GDRIVE_APPEND_WAIT", "0.025"))
+
+# Most rows sent in one values.append call (GDRIVE_APPEND_MAX_ROWS env var)
+APPEND_MAX_ROWS = int(os.getenv("GDRIVE_APPEND_MAX_ROWS", "100"))
+
+# Categories and headers used when create_expense_sheet is not given any
+DEFAULT_EXPENSE_CATEGORIES = (
+    "Food & Dining",
+    "Transportation",
+    "Shopping",
+    "Bills & Utilities",
+    "Healthcare",
+    "Entertainment",
+    "Travel",
+    "Education",
+    "Personal Care",
+    "Other"
+)
+DEFAULT_EXPENSE_HEADERS = (
+    "Date",
+    "Description",
+    "Category",
+    "Amount",
+    "Payment Method",
+    "Notes",
+    "Tags"
+)
+
+# Headers that pasteData keeps as literal text: no digits (numbers, dates),
+# formula or sign prefixes, or surrounding spaces
+PLAIN_HEADER = re.compile(r"[A-Za-z](?:[A-Za-z &'/()_-]*[A-Za-z)])?")
+
+# Fixed batchUpdate requests sent by create_expense_sheet, built once
+HEADER_FORMAT_REQUEST = {
+    'repeatCell': {
+        'range': {
+            'sheetId': 0,
+            'startRowIndex': 0,
+            'endRowIndex': 1
+        },
+        'cell': {
+            'userEnteredFormat': {
+                'backgroundColor': {'red': 0.2, 'green': 0.2, 'blue': 0.2},
+                'textFormat': {
+                    'foregroundColor': {'red': 1, 'green': 1, 'blue': 1},
+                    'bold': True
+                }
+            }
+        },
+        'fields': 'userEnteredFormat'
+    }
+}
+SHEET_TYPE_METADATA_REQUEST = {
+    'createDeveloperMetadata': {
+        'developerMetadata': {
+            'metadataKey': 'sheet_type',
+            'metadataValue': 'expense_tracker',
+            'location': {
+                'spreadsheet': True
+            },
+            'visibility': 'DOCUMENT'
+        }
+    }
+}
+
+# Developer metadata key holding the header name -> column index map
+HEADER_INDEX_KEY = 'expense_header_index'
+
+# Headers get_expense_summary reads, with the column used when one is missing
+SUMMARY_COLUMNS = (("Date", 0), ("Category", 2), ("Amount", 3))
+
+# Spreadsheets whose header index map and title are kept in memory
+HEADER_CACHE_SIZE = 256
+
+# Seconds a spreadsheet title is reused by read_sheet_cells
+TITLE_CACHE_TTL = 300
+
+# Sheets read responses kept in memory, and seconds each is reused; writes
+# through these tools drop a spreadsheet's entries immediately
+READ_CACHE_SIZE = 256
+READ_CACHE_TTL = 30
+
+
+class RequestCoalescer:
+    """
+    Merges items submitted for the same key within a short window into one call.
+    
+    `flush(key, items)` receives the queued items in submission order and
+    returns one result per item. A batch is sent `max_wait` seconds after its
+    first item arrives, or as soon as `max_items` are queued.
+    
+    When a merged call fails, every caller gets its exception, unless
+    `split_on_error(exception)` is true: then each item is re-sent on its
+    own so callers get their own result or error. Only allow that for
+    errors where nothing was applied, or items could be written twice.
+    """
+    
+    def __init__(
+        self,
+        flush: Callable[[str, List[Any]], Awaitable[List[Any]]],
+        max_wait: float,
+        max_items: int,
+        split_on_error: Callable[[Exception], bool] = lambda e: False
+    ):
+        self._flush = flush
+        self.max_wait = max_wait
+        self.max_items = max_items
+        self._split_on_error = split_on_error
+        self._pending: Dict[str, Tuple[List[Tuple[Any, asyncio.Future]], asyncio.Event]] = {}
+        self._tasks: Set[asyncio.Task] = set()
+    
+    async def submit(self, key: str, item: Any) -> Any:
+        """Queue an item for key and wait for its result."""
+        future = asyncio.get_running_loop().create_future()
+        
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = self._pending[key] = ([], asyncio.Event())
+            task = asyncio.create_task(self._run(key, batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        
+        entries, full = batch
+        entries.append((item, future))
+        if len(entries) >= self.max_items:
+            # Later submissions start a new batch
+            del self._pending[key]
+            full.set()
+        return await future
+    
+    async def _run(self, key: str, batch: Tuple[List[Tuple[Any, asyncio.Future]], asyncio.Event]) -> None:
+        entries, full = batch
+        try:
+            await asyncio.wait_for(full.wait(), timeout=self.max_wait)
+        except asyncio.TimeoutError:
+            pass
+        if self._pending.get(key) is batch:
+            del self._pending[key]
+        
+        try:
+            results = await self._flush(key, [item for item, _ in entries])
+        except Exception as e:
+            if len(entries) == 1 or not self._split_on_error(e):
+                self._resolve(entries, exception=e)
+                return
+            # A merged call fails as a whole, so retry each item on its own
+            # to give every caller its own result or error
+            await asyncio.gather(*(self._flush_one(key, entry) for entry in entries))
+            return
+        self._resolve(entries, results)
+    
+    async def _flush_one(self, key: str, entry: Tuple[Any, asyncio.Future]) -> None:
+        try:
+            results = await self._flush(key, [entry[0]])
+        except Exception as e:
+            self._resolve([entry], exception=e)
+        else:
+            self._resolve([entry], results)
+    
+    @staticmethod
+    def _resolve(
+        entries: List[Tuple[Any, asyncio.Future]],
+        results: Optional[List[Any]] = None,
+        exception: Optional[Exception] = None
+    ) -> None:
+        for i, (_, future) in enumerate(entries):
+            if future.done():
+                continue
+            if exception is not None:
+                future.set_exception(exception)
+            else:
+                future.set_result(results[i])
+
+
+def column_letter(index: int) -> str:
+    """Convert a zero-based column index to A1 notation letters (0 -> A, 26 -> AA)."""
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+    return letters
+
+
+def split_appended_range(updated_range: str, count: int) -> List[str]:
+    """
+    Split the updatedRange of a multi-row append into one range per row.
+    
+    Args:
+        updated_range: Range reported by values.append (e.g. "Sheet1!A5:G7")
+        count: Number of rows that were appended
+        
+    Returns:
+        A1 ranges of the appended rows, in order (e.g. "Sheet1!A5:G5")
+    """
+    sheet, _, cells = updated_range.rpartition('!')
+    prefix = f"{sheet}!" if sheet else ""
+    start, _, end = cells.partition(':')
+    start_column = start.rstrip('0123456789')
+    end_column = (end or start).rstrip('0123456789')
+    first_row = int(start[len(start_column):])
+    return [
+        f"{prefix}{start_column}{row}:{end_column}{row}"
+        for row in range(first_row, first_row + count)
+    ]
+
+
+def summarize_expenses(
+    dates: List[Any],
+    categories: List[Any],
+    amounts: List[Any],
+    date_bounds: Optional[Tuple[str, str]] = None
+) -> Tuple[float, Dict[str, Dict[str, Any]], int]:
+    """
+    Total expenses overall and by category.
+    
+    The three columns are parallel lists of data cells, without the header.
+    Sheets drops trailing empty cells, so a column may be shorter than the others.
+    
+    Args:
+        dates: Date column values
+        categories: Category column values
+        amounts: Amount column values
+        date_bounds: Optional inclusive (start, end) date strings to filter on
+        
+    Returns:
+        Tuple of (total, per-category amount and count, transaction count)
+    """
+    total = 0.0
+    transaction_count = 0
+    # [amount, count] per category, updated in place
+    totals = defaultdict(lambda: [0.0, 0])
+    category_count = len(categories)
+    date_count = len(dates) if date_bounds else 0
+    
+    for i, raw_amount in enumerate(amounts):
+        try:
+            amount = float(raw_amount)
+        except (ValueError, TypeError):
+            continue
+        
+        # Apply date filter if provided
+        if i < date_count and not (date_bounds[0] <= str(dates[i]) <= date_bounds[1]):
+            continue
+        
+        entry = totals[categories[i] if i < category_count else "Uncategorized"]
+        entry[0] += amount
+        entry[1] += 1
+        total += amount
+        transaction_count += 1
+    
+    by_category = {
+        category: {"amount": amount, "count": count}
+        for category, (amount, count) in totals.items()
+    }
+    return total, by_category, transaction_count
+
 
 def register_sheets_tools(mcp: FastMCP, drive_service: Any) -> None:
     """Register all Google Sheets tools with the MCP server."""
     
     # Build sheets service using the same credentials
     creds = drive_service._http.credentials
-    sheets_service = build('sheets', 'v4', credentials=creds)
+    sheets_service = build_service('sheets', 'v4', creds)
+    
+    # Recent read responses, keyed by (spreadsheet ID, kind, parameters...)
+    sheet_reads = TaskCache(maxsize=READ_CACHE_SIZE, ttl=READ_CACHE_TTL)
+    
+    def invalidate_reads(spreadsheet_id: str) -> None:
+        """Forget cached reads of a spreadsheet after writing to it."""
+        sheet_reads.invalidate(lambda key: key[0] == spreadsheet_id)
+    
+    async def flush_batch_update(spreadsheet_id: str, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Send queued requests for one spreadsheet as a single batchUpdate."""
+        response = await execute(sheets_service.spreadsheets().batchUpdate(
+            spreadsheetId=spreadsheet_id,
+            body={'requests': requests}
+        ))
+        invalidate_reads(spreadsheet_id)
+        return response.get('replies', [{}] * len(requests))
+    
+    # Single-request batchUpdates from concurrent tool calls share one API call.
+    # A batchUpdate rejected with 400 applied none of its requests, so only
+    # then is each request re-sent alone to find which one was invalid
+    batch_updates = RequestCoalescer(
+        flush_batch_update,
+        max_wait=BATCH_UPDATE_WAIT,
+        max_items=BATCH_UPDATE_MAX_REQUESTS,
+        split_on_error=lambda e: isinstance(e, HttpError) and e.resp.status == 400
+    )
+    
+    async def flush_append(spreadsheet_id: str, rows: List[List[Any]]) -> List[Dict[str, Any]]:
+        """Append queued rows for one spreadsheet in a single values.append."""
+        # Appending (rather than updating a tracked next row) lets Sheets
+        # place the rows, so rows added by other clients are never overwritten
+        result = await execute(sheets_service.spreadsheets().values().append(
+            spreadsheetId=spreadsheet_id,
+            range='A:G',  # Assumes standard expense tracking columns
+            valueInputOption='USER_ENTERED',
+            insertDataOption='INSERT_ROWS',
+            body={'values': rows},
+            fields='updates(updatedRange,updatedRows)'
+        ))
+        invalidate_reads(spreadsheet_id)
+        
+        updated_range = result.get('updates', {}).get('updatedRange')
+        if not updated_range:
+            return [{}] * len(rows)
+        return [
+            {'updatedRange': row_range, 'updatedRows': 1}
+            for row_range in split_appended_range(updated_range, len(rows))
+        ]
+    
+    # Rows appended by concurrent tool calls share one API call; a failed
+    # append is never re-sent, since the rows may already have been written
+    appends = RequestCoalescer(
+        flush_append,
+        max_wait=APPEND_WAIT,
+        max_items=APPEND_MAX_ROWS
+    )
+    
+    async def load_header_index(spreadsheet_id: str, use_metadata: bool = True) -> Dict[str, int]:
+        """
+        Map header names to column indices.
+        
+        Prefers the map stored by create_expense_sheet, which may be stale if
+        columns were since moved or renamed; callers check it against the
+        header cells they read and reload with use_metadata=False on mismatch.
+        """
+        if use_metadata:
+            result = await execute(sheets_service.spreadsheets().developerMetadata().search(
+                spreadsheetId=spreadsheet_id,
+                body={'dataFilters': [{'developerMetadataLookup': {'metadataKey': HEADER_INDEX_KEY}}]}
+            ), num_retries=READ_RETRIES)
+            matches = [item['developerMetadata'] for item in result.get('matchedDeveloperMetadata', [])]
+            if matches:
+                # set_sheet_metadata adds entries rather than replacing them, so use the newest
+                newest = max(matches, key=lambda metadata: metadata.get('metadataId', 0))
+                try:
+                    header_index = json.loads(newest.get('metadataValue', ''))
+                except ValueError:
+                    header_index = None
+                # The key can be set to anything through set_sheet_metadata, so
+                # only a map of header names to column indices is trusted
+                if isinstance(header_index, dict) and all(
+                    isinstance(header, str)
+                    and isinstance(column, int)
+                    and not isinstance(column, bool)
+                    and column >= 0
+                    for header, column in header_index.items()
+                ):
+                    return header_index
+        
+        # Sheets created elsewhere have no stored map, so read the header row
+        result = await execute(sheets_service.spreadsheets().values().get(
+            spreadsheetId=spreadsheet_id,
+            range='1:1',
+            valueRenderOption='UNFORMATTED_VALUE'
+        ), num_retries=READ_RETRIES)
+        header_index = {}
+        for i, header in enumerate(result.get('values', [[]])[0]):
+            header_index.setdefault(header, i)
+        return header_index
+    
+    # Header index maps by spreadsheet ID, so summaries skip the lookup
+    header_indices = TaskCache(maxsize=HEADER_CACHE_SIZE)
+    
+    async def read_summary_columns(spreadsheet_id: str, header_index: Dict[str, int]) -> List[List[Any]]:
+        """Read the Date, Category and Amount columns, header cell included, one list per column."""
+        ranges = [
+            f"{column_letter(i)}:{column_letter(i)}"
+            for i in (header_index.get(name, default) for name, default in SUMMARY_COLUMNS)
+        ]
+        result = await sheet_reads.get_or_create(
+            (spreadsheet_id, 'columns', *ranges),
+            lambda: execute(sheets_service.spreadsheets().values().batchGet(
+                spreadsheetId=spreadsheet_id,
+                ranges=ranges,
+                majorDimension='COLUMNS',
+                valueRenderOption='UNFORMATTED_VALUE',
+                dateTimeRenderOption='FORMATTED_STRING',
+                fields='valueRanges.values'
+            ), num_retries=READ_RETRIES)
+        )
+        return [value_range.get('values', [[]])[0] for value_range in result.get('valueRanges', [])]
+    
+    async def load_title(spreadsheet_id: str) -> str:
+        """Fetch a spreadsheet's title."""
+        result = await execute(sheets_service.spreadsheets().get(
+            spreadsheetId=spreadsheet_id,
+            fields="properties.title"
+        ), num_retries=READ_RETRIES)
+        return result['properties']['title']
+    
+    # Titles rarely change, so reads reuse them for a few minutes
+    titles = TaskCache(maxsize=HEADER_CACHE_SIZE, ttl=TITLE_CACHE_TTL)
     
     @mcp.tool()
     async def create_expense_sheet(
@@ -36,35 +443,13 @@ def register_sheets_tools(mcp: FastMCP, drive_service: Any) -> None:
             Dictionary containing sheet ID, URL, and setup details
         """
         try:
-            # Default categories for expense tracking
+            # Default categories and headers for expense tracking
             if categories is None:
-                categories = [
-                    "Food & Dining",
-                    "Transportation",
-                    "Shopping",
-                    "Bills & Utilities",
-                    "Healthcare",
-                    "Entertainment",
-                    "Travel",
-                    "Education",
-                    "Personal Care",
-                    "Other"
-                ]
-            
-            # Default headers for expense tracking
+                categories = DEFAULT_EXPENSE_CATEGORIES
             if initial_headers is None:
-                initial_headers = [
-                    "Date",
-                    "Description",
-                    "Category",
-                    "Amount",
-                    "Payment Method",
-                    "Notes",
-                    "Tags"
-                ]
+                initial_headers = DEFAULT_EXPENSE_HEADERS
             
             # Create the sheet first using Drive API
-            import os
             target_folder = folder_id or os.getenv("FOLDER_ID")
             
             file_metadata = {
@@ -74,47 +459,48 @@ def register_sheets_tools(mcp: FastMCP, drive_service: Any) -> None:
             if target_folder:
                 file_metadata['parents'] = [target_folder]
             
-            sheet_file = drive_service.files().create(
+            sheet_file = await execute(drive_service.files().create(
                 body=file_metadata,
                 fields='id, webViewLink'
-            ).execute()
+            ))
             
             spreadsheet_id = sheet_file['id']
             
-            # Now set up the sheet structure
-            requests = []
-            
-            # Add headers
-            requests.append({
-                'updateCells': {
-                    'rows': [{
-                        'values': [{'userEnteredValue': {'stringValue': h}} for h in initial_headers]
-                    }],
-                    'fields': 'userEnteredValue',
-                    'start': {'sheetId': 0, 'rowIndex': 0, 'columnIndex': 0}
+            # Now set up the sheet structure: headers, then their format
+            if all(
+                PLAIN_HEADER.fullmatch(h)
+                and h.upper() not in ('TRUE', 'FALSE')
+                and not any(char in h for char in '\t\r\n')
+                for h in initial_headers
+            ):
+                # Plain text headers go as one tab-separated string rather
+                # than a cell object per header; a tab or line break would
+                # split the paste into other cells
+                header_request = {
+                    'pasteData': {
+                        'coordinate': {'sheetId': 0, 'rowIndex': 0, 'columnIndex': 0},
+                        'data': '\t'.join(initial_headers),
+                        'type': 'PASTE_VALUES',
+                        'delimiter': '\t'
+                    }
                 }
-            })
-            
-            # Format header row
-            requests.append({
-                'repeatCell': {
-                    'range': {
-                        'sheetId': 0,
-                        'startRowIndex': 0,
-                        'endRowIndex': 1
-                    },
-                    'cell': {
-                        'userEnteredFormat': {
-                            'backgroundColor': {'red': 0.2, 'green': 0.2, 'blue': 0.2},
-                            'textFormat': {
-                                'foregroundColor': {'red': 1, 'green': 1, 'blue': 1},
-                                'bold': True
-                            }
-                        }
-                    },
-                    'fields': 'userEnteredFormat'
+            else:
+                # Pasted text is parsed like typed input, so headers such as
+                # "2024", "50%" or ones with line breaks are written as
+                # literal strings instead
+                header_request = {
+                    'updateCells': {
+                        'rows': [{
+                            'values': [{'userEnteredValue': {'stringValue': h}} for h in initial_headers]
+                        }],
+                        'fields': 'userEnteredValue',
+                        'start': {'sheetId': 0, 'rowIndex': 0, 'columnIndex': 0}
+                    }
                 }
-            })
+            requests = [
+                header_request,
+                HEADER_FORMAT_REQUEST
+            ]
             
             # Add data validation for category column (column C, index 2)
             if "Category" in initial_headers:
@@ -196,11 +582,14 @@ def register_sheets_tools(mcp: FastMCP, drive_service: Any) -> None:
             })
             
             # Add developer metadata for expense tracking
+            requests.append(SHEET_TYPE_METADATA_REQUEST)
+            
+            # Store categories as metadata
             requests.append({
                 'createDeveloperMetadata': {
                     'developerMetadata': {
-                        'metadataKey': 'sheet_type',
-                        'metadataValue': 'expense_tracker',
+                        'metadataKey': 'expense_categories',
+                        'metadataValue': json.dumps(categories),
                         'location': {
                             'spreadsheet': True
                         },
@@ -209,12 +598,12 @@ def register_sheets_tools(mcp: FastMCP, drive_service: Any) -> None:
                 }
             })
             
-            # Store categories as metadata
+            # Store header positions so summaries need not read the header row
             requests.append({
                 'createDeveloperMetadata': {
                     'developerMetadata': {
-                        'metadataKey': 'expense_categories',
-                        'metadataValue': json.dumps(categories),
+                        'metadataKey': HEADER_INDEX_KEY,
+                        'metadataValue': json.dumps({header: i for i, header in reversed(list(enumerate(initial_headers)))}),
                         'location': {
                             'spreadsheet': True
                         },
@@ -224,10 +613,10 @@ def register_sheets_tools(mcp: FastMCP, drive_service: Any) -> None:
             })
             
             # Execute all requests
-            batch_update_response = sheets_service.spreadsheets().batchUpdate(
+            batch_update_response = await execute(sheets_service.spreadsheets().batchUpdate(
                 spreadsheetId=spreadsheet_id,
                 body={'requests': requests}
-            ).execute()
+            ))
             
             return {
                 "success": True,
@@ -263,29 +652,29 @@ def register_sheets_tools(mcp: FastMCP, drive_service: Any) -> None:
             Dictionary containing cell values and metadata
         """
         try:
-            # Get values
-            result = sheets_service.spreadsheets().values().get(
-                spreadsheetId=spreadsheet_id,
-                range=range_notation,
-                valueRenderOption='UNFORMATTED_VALUE',
-                dateTimeRenderOption='FORMATTED_STRING'
-            ).execute()
+            # Get values, with the title fetched alongside on a cache miss
+            result, title = await asyncio.gather(
+                sheet_reads.get_or_create(
+                    (spreadsheet_id, 'values', range_notation),
+                    lambda: execute(sheets_service.spreadsheets().values().get(
+                        spreadsheetId=spreadsheet_id,
+                        range=range_notation,
+                        valueRenderOption='UNFORMATTED_VALUE',
+                        dateTimeRenderOption='FORMATTED_STRING'
+                    ), num_retries=READ_RETRIES)
+                ),
+                titles.get_or_create(spreadsheet_id, lambda: load_title(spreadsheet_id))
+            )
             
             values = result.get('values', [])
             
-            # Get sheet metadata
-            sheet_metadata = sheets_service.spreadsheets().get(
-                spreadsheetId=spreadsheet_id,
-                fields="properties.title,sheets.properties"
-            ).execute()
-            
             return {
                 "spreadsheet_id": spreadsheet_id,
-                "spreadsheet_title": sheet_metadata['properties']['title'],
+                "spreadsheet_title": title,
                 "range": range_notation,
                 "values": values,
                 "rows": len(values),
-                "columns": max(len(row) for row in values) if values else 0
+                "columns": max(map(len, values), default=0)
             }
             
         except HttpError as e:
@@ -318,12 +707,15 @@ def register_sheets_tools(mcp: FastMCP, drive_service: Any) -> None:
                 'values': values
             }
             
-            result = sheets_service.spreadsheets().values().update(
+            result = await execute(sheets_service.spreadsheets().values().update(
                 spreadsheetId=spreadsheet_id,
                 range=range_notation,
                 valueInputOption=value_input_option,
                 body=body
-            ).execute()
+            ), num_retries=READ_RETRIES)
+            invalidate_reads(spreadsheet_id)
+            # The update may have rewritten the header row
+            header_indices.invalidate(lambda cached_id: cached_id == spreadsheet_id)
             
             return {
                 "success": True,
@@ -378,22 +770,12 @@ def register_sheets_tools(mcp: FastMCP, drive_service: Any) -> None:
                 tags or ""
             ]
             
-            body = {
-                'values': [row_data]
-            }
-            
-            result = sheets_service.spreadsheets().values().append(
-                spreadsheetId=spreadsheet_id,
-                range='A:G',  # Assumes standard expense tracking columns
-                valueInputOption='USER_ENTERED',
-                insertDataOption='INSERT_ROWS',
-                body=body
-            ).execute()
+            result = await appends.submit(spreadsheet_id, row_data)
             
             return {
                 "success": True,
-                "updated_range": result.get('updates', {}).get('updatedRange', ''),
-                "updated_rows": result.get('updates', {}).get('updatedRows', 0),
+                "updated_range": result.get('updatedRange', ''),
+                "updated_rows": result.get('updatedRows', 0),
                 "expense": {
                     "date": date,
                     "description": description,
@@ -445,10 +827,9 @@ def register_sheets_tools(mcp: FastMCP, drive_service: Any) -> None:
                 }
             }
             
-            result = sheets_service.spreadsheets().batchUpdate(
-                spreadsheetId=spreadsheet_id,
-                body={'requests': [request]}
-            ).execute()
+            await batch_updates.submit(spreadsheet_id, request)
+            if key == HEADER_INDEX_KEY:
+                header_indices.invalidate(lambda cached_id: cached_id == spreadsheet_id)
             
             return {
                 "success": True,
@@ -491,10 +872,13 @@ def register_sheets_tools(mcp: FastMCP, drive_service: Any) -> None:
             if data_filters:
                 request_body['dataFilters'] = data_filters
             
-            result = sheets_service.spreadsheets().developerMetadata().search(
-                spreadsheetId=spreadsheet_id,
-                body=request_body
-            ).execute()
+            result = await sheet_reads.get_or_create(
+                (spreadsheet_id, 'metadata', key),
+                lambda: execute(sheets_service.spreadsheets().developerMetadata().search(
+                    spreadsheetId=spreadsheet_id,
+                    body=request_body
+                ), num_retries=READ_RETRIES)
+            )
             
             metadata_items = []
             for item in result.get('matchedDeveloperMetadata', []):
@@ -560,10 +944,7 @@ def register_sheets_tools(mcp: FastMCP, drive_service: Any) -> None:
                 }
             }
             
-            result = sheets_service.spreadsheets().batchUpdate(
-                spreadsheetId=spreadsheet_id,
-                body={'requests': [request]}
-            ).execute()
+            await batch_updates.submit(spreadsheet_id, request)
             
             return {
                 "success": True,
@@ -593,59 +974,48 @@ def register_sheets_tools(mcp: FastMCP, drive_service: Any) -> None:
         Returns:
             Dictionary containing expense summary by category
         """
+        # Parse the date filter once rather than for every row
+        date_bounds = None
+        if date_range:
+            start_date, sep, end_date = date_range.partition(':')
+            if not sep:
+                return {"error": "Invalid date_range, expected START:END (e.g. 2024-01-01:2024-12-31)"}
+            date_bounds = (start_date, end_date)
+        
         try:
-            # Read all data
-            result = sheets_service.spreadsheets().values().get(
-                spreadsheetId=spreadsheet_id,
-                range='A:G',
-                valueRenderOption='UNFORMATTED_VALUE'
-            ).execute()
+            # Find column indices and read only those three columns
+            header_index = await header_indices.get_or_create(
+                spreadsheet_id,
+                lambda: load_header_index(spreadsheet_id)
+            )
+            columns = await read_summary_columns(spreadsheet_id, header_index)
             
-            values = result.get('values', [])
-            if len(values) < 2:  # No data beyond headers
+            # A header cell that no longer matches means columns were moved or
+            # renamed since the map was stored, so rebuild it from row 1
+            if not all(
+                column[:1] == [name]
+                for (name, _), column in zip(SUMMARY_COLUMNS, columns)
+                if name in header_index
+            ):
+                header_indices.invalidate(lambda cached_id: cached_id == spreadsheet_id)
+                header_index = await header_indices.get_or_create(
+                    spreadsheet_id,
+                    lambda: load_header_index(spreadsheet_id, use_metadata=False)
+                )
+                columns = await read_summary_columns(spreadsheet_id, header_index)
+            
+            # Skip the header cell of each column
+            dates, categories, amounts = (column[1:] for column in columns)
+            if not amounts:  # No data beyond headers
                 return {
                     "total": 0,
                     "by_category": {},
                     "transaction_count": 0
                 }
             
-            # Skip header row
-            headers = values[0]
-            data_rows = values[1:]
-            
-            # Find column indices
-            date_idx = headers.index("Date") if "Date" in headers else 0
-            category_idx = headers.index("Category") if "Category" in headers else 2
-            amount_idx = headers.index("Amount") if "Amount" in headers else 3
-            
-            # Process data
-            total = 0
-            by_category = {}
-            transaction_count = 0
-            
-            for row in data_rows:
-                if len(row) > amount_idx:
-                    try:
-                        amount = float(row[amount_idx])
-                        category = row[category_idx] if len(row) > category_idx else "Uncategorized"
-                        
-                        # Apply date filter if provided
-                        if date_range and len(row) > date_idx:
-                            date_str = str(row[date_idx])
-                            start_date, end_date = date_range.split(':')
-                            if not (start_date <= date_str <= end_date):
-                                continue
-                        
-                        total += amount
-                        transaction_count += 1
-                        
-                        if category not in by_category:
-                            by_category[category] = {"amount": 0, "count": 0}
-                        by_category[category]["amount"] += amount
-                        by_category[category]["count"] += 1
-                        
-                    except (ValueError, TypeError):
-                        continue
+            total, by_category, transaction_count = summarize_expenses(
+                dates, categories, amounts, date_bounds
+            )
             
             return {
                 "spreadsheet_id": spreadsheet_id,